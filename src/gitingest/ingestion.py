@@ -2,11 +2,11 @@
 
 import warnings
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 from gitingest.config import MAX_DIRECTORY_DEPTH, MAX_FILES, MAX_TOTAL_SIZE_BYTES
 from gitingest.filesystem_schema import FileSystemNode, FileSystemNodeType, FileSystemStats
-from gitingest.output_formatters import format_directory, format_single_file
+from gitingest.output_formatters import format_directory, format_directory_with_readme, format_single_file
 from gitingest.query_parsing import ParsedQuery
 from gitingest.utils.ingestion_utils import _should_exclude, _should_include
 from gitingest.utils.path_utils import _is_safe_symlink
@@ -40,13 +40,7 @@ def ingest_query(query: ParsedQuery) -> Tuple[str, str, str]:
     ValueError
         If the specified path cannot be found or if the file is not a text file.
     """
-    subpath = Path(query.subpath.strip("/")).as_posix()
-    path = query.local_path / subpath
-
-    apply_gitingest_file(path, query)
-
-    if not path.exists():
-        raise ValueError(f"{query.slug} cannot be found")
+    path = _resolve_query_path(query)
 
     if (query.type and query.type == "blob") or query.local_path.is_file():
         # TODO: We do this wrong! We should still check the branch and commit!
@@ -83,6 +77,122 @@ def ingest_query(query: ParsedQuery) -> Tuple[str, str, str]:
     return format_directory(root_node, query)
 
 
+def ingest_query_with_readme(query: ParsedQuery) -> Tuple[str, str, Optional[str]]:
+    """
+    Run a tree-only ingestion process for a parsed query, reading the README as the only file content.
+
+    The directory is walked once to build the tree without reading the content of any file, and the `README.md`
+    at its root is looked up separately, so that it is still read when the walk stops at `MAX_FILES` or
+    `MAX_TOTAL_SIZE_BYTES` before reaching it.
+
+    Parameters
+    ----------
+    query : ParsedQuery
+        The parsed query object containing information about the repository and query parameters.
+
+    Returns
+    -------
+    Tuple[str, str, Optional[str]]
+        A tuple containing the summary, directory structure, and README content (None if there is no README).
+
+    Raises
+    ------
+    ValueError
+        If the specified path cannot be found or if the file is not a text file.
+    """
+    if (query.type and query.type == "blob") or query.local_path.is_file():
+        summary, tree, _ = ingest_query(query)
+        return summary, tree, None
+
+    path = _resolve_query_path(query)
+    root_node = FileSystemNode(
+        name=path.name,
+        type=FileSystemNodeType.DIRECTORY,
+        path_str=str(path.relative_to(query.local_path)),
+        path=path,
+    )
+
+    _process_node(
+        node=root_node,
+        query=query,
+        stats=FileSystemStats(),
+    )
+
+    readme_node = _find_readme(path, query.local_path, query.max_file_size)
+    return format_directory_with_readme(root_node, query, readme_node)
+
+
+def _find_readme(path: Path, local_path: Path, max_file_size: Optional[int] = None) -> Optional[FileSystemNode]:
+    """
+    Find the `README.md` file at the root of a directory, matching its name case-insensitively.
+
+    Parameters
+    ----------
+    path : Path
+        The directory to look for the README in.
+    local_path : Path
+        The base path of the repository or directory being processed.
+    max_file_size : int, optional
+        The maximum size in bytes of the README to include, or None for no limit.
+
+    Returns
+    -------
+    Optional[FileSystemNode]
+        The node of the README file, or None if there is no README or it is larger than `max_file_size`.
+    """
+    for item in path.iterdir():
+        if item.name.lower() != "readme.md" or not item.is_file():
+            continue
+        if item.is_symlink() and not _is_safe_symlink(item, local_path):
+            continue
+
+        file_size = item.stat().st_size
+        if max_file_size is not None and file_size > max_file_size:
+            return None
+
+        return FileSystemNode(
+            name=item.name,
+            type=FileSystemNodeType.FILE,
+            size=file_size,
+            file_count=1,
+            path_str=str(item.relative_to(local_path)),
+            path=item,
+            depth=1,
+        )
+
+    return None
+
+
+def _resolve_query_path(query: ParsedQuery) -> Path:
+    """
+    Resolve the path to ingest for a parsed query and apply its .gitingest file.
+
+    Parameters
+    ----------
+    query : ParsedQuery
+        The parsed query object containing information about the repository and query parameters.
+
+    Returns
+    -------
+    Path
+        The path of the directory or file to ingest.
+
+    Raises
+    ------
+    ValueError
+        If the specified path cannot be found.
+    """
+    subpath = Path(query.subpath.strip("/")).as_posix()
+    path = query.local_path / subpath
+
+    apply_gitingest_file(path, query)
+
+    if not path.exists():
+        raise ValueError(f"{query.slug} cannot be found")
+
+    return path
+
+
 def apply_gitingest_file(path: Path, query: ParsedQuery) -> None:
     """
     Apply the .gitingest file to the query object.
@@ -177,37 +287,50 @@ def _process_node(
     if limit_exceeded(stats, node.depth):
         return
 
+    # Bind the values used for every entry to locals once, instead of looking them up on each iteration
+    local_path = query.local_path
+    ignore_patterns = query.ignore_patterns
+    include_patterns = query.include_patterns
+    max_file_size = query.max_file_size
+    visited = stats.visited
+
     for sub_path in node.path.iterdir():
 
         symlink_path = None
         if sub_path.is_symlink():
-            if not _is_safe_symlink(sub_path, query.local_path):
+            if not _is_safe_symlink(sub_path, local_path):
                 print(f"Skipping unsafe symlink: {sub_path}")
                 continue
 
             symlink_path = sub_path
             sub_path = sub_path.resolve()
 
-        if sub_path in stats.visited:
+        if sub_path in visited:
             print(f"Skipping already visited path: {sub_path}")
             continue
 
-        stats.visited.add(sub_path)
+        visited.add(sub_path)
 
-        if query.ignore_patterns and _should_exclude(sub_path, query.local_path, query.ignore_patterns):
+        if ignore_patterns and _should_exclude(sub_path, local_path, ignore_patterns):
             continue
 
-        if query.include_patterns and not _should_include(sub_path, query.local_path, query.include_patterns):
+        if include_patterns and not _should_include(sub_path, local_path, include_patterns):
             continue
 
         if sub_path.is_file():
-            _process_file(path=sub_path, parent_node=node, stats=stats, local_path=query.local_path)
+            _process_file(
+                path=sub_path,
+                parent_node=node,
+                stats=stats,
+                local_path=local_path,
+                max_file_size=max_file_size,
+            )
         elif sub_path.is_dir():
 
             child_directory_node = FileSystemNode(
                 name=sub_path.name,
                 type=FileSystemNodeType.DIRECTORY,
-                path_str=str(sub_path.relative_to(query.local_path)),
+                path_str=str(sub_path.relative_to(local_path)),
                 path=sub_path,
                 depth=node.depth + 1,
             )
@@ -233,12 +356,18 @@ def _process_node(
     node.sort_children()
 
 
-def _process_file(path: Path, parent_node: FileSystemNode, stats: FileSystemStats, local_path: Path) -> None:
+def _process_file(
+    path: Path,
+    parent_node: FileSystemNode,
+    stats: FileSystemStats,
+    local_path: Path,
+    max_file_size: Optional[int] = None,
+) -> None:
     """
     Process a file in the file system.
 
     This function checks the file's size, increments the statistics, and reads its content.
-    If the file size exceeds the maximum allowed, it raises an error.
+    Files larger than `max_file_size` are skipped.
 
     Parameters
     ----------
@@ -250,8 +379,13 @@ def _process_file(path: Path, parent_node: FileSystemNode, stats: FileSystemStat
         Statistics tracking object for the total file count and size.
     local_path : Path
         The base path of the repository or directory being processed.
+    max_file_size : int, optional
+        The maximum size in bytes of a file to include, or None for no limit.
     """
     file_size = path.stat().st_size
+    if max_file_size is not None and file_size > max_file_size:
+        return
+
     if stats.total_size + file_size > MAX_TOTAL_SIZE_BYTES:
         print(f"Skipping file {path}: would exceed total size limit")
         return
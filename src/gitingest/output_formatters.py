@@ -208,3 +208,40 @@ def format_directory(root_node: FileSystemNode, query: ParsedQuery) -> Tuple[str
         summary += f"\nEstimated tokens: {formatted_tokens}"
 
     return summary, tree, files_content
+
+
+def format_directory_with_readme(
+    root_node: FileSystemNode,
+    query: ParsedQuery,
+    readme_node: Optional[FileSystemNode],
+) -> Tuple[str, str, Optional[str]]:
+    """
+    Return the summary and directory structure of a directory, along with the content of its README.
+
+    Unlike `format_directory`, only the given README is read, so the token estimation covers the directory
+    structure and the README only.
+
+    Parameters
+    ----------
+    root_node : FileSystemNode
+        The root node representing the directory to process.
+    query : ParsedQuery
+        The parsed query object containing information about the repository and query parameters.
+    readme_node : FileSystemNode, optional
+        The node of the README at the root of the directory, or None if there is no README.
+
+    Returns
+    -------
+    Tuple[str, str, Optional[str]]
+        A tuple containing the summary, directory structure, and README content (None if there is no README).
+    """
+    summary = _create_summary_string(query, node=root_node)
+    tree = "Directory structure:\n" + _create_tree_structure(query, root_node)
+
+    readme_content = readme_node.content_string if readme_node else None
+
+    formatted_tokens = _generate_token_string(tree + (readme_content or ""))
+    if formatted_tokens:
+        summary += f"\nEstimated tokens: {formatted_tokens}"
+
+    return summary, tree, readme_content
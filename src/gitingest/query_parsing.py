@@ -39,7 +39,7 @@ class ParsedQuery:  # pylint: disable=too-many-instance-attributes
     type: Optional[str] = None
     branch: Optional[str] = None
     commit: Optional[str] = None
-    max_file_size: int = MAX_FILE_SIZE
+    max_file_size: Optional[int] = MAX_FILE_SIZE
     ignore_patterns: Optional[Set[str]] = None
     include_patterns: Optional[Set[str]] = None
     pattern_type: Optional[str] = None
@@ -73,7 +73,7 @@ class ParsedQuery:  # pylint: disable=too-many-instance-attributes
 
 async def parse_query(
     source: str,
-    max_file_size: int,
+    max_file_size: Optional[int],
     from_web: bool,
     include_patterns: Optional[Union[str, Set[str]]] = None,
     ignore_patterns: Optional[Union[str, Set[str]]] = None,
@@ -89,8 +89,8 @@ async def parse_query(
     ----------
     source : str
         The source URL or file path to parse.
-    max_file_size : int
-        The maximum file size in bytes to include.
+    max_file_size : int, optional
+        The maximum file size in bytes to include, or None for no limit.
     from_web : bool
         Flag indicating whether the source is a web URL.
     include_patterns : Union[str, Set[str]], optional
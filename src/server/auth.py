@@ -1,7 +1,10 @@
 """Authentication module for API key validation."""
 
+import hmac
 import os
-from fastapi import HTTPException, Security
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, Security
 from fastapi.security.api_key import APIKeyHeader
 
 # API key configuration
@@ -9,6 +12,32 @@ API_KEY_NAME = "X-API-Key"
 API_KEY = os.getenv("API_KEY")
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
+# Encoded once at import so every request compares bytes without re-reading the module global
+_API_KEY_BYTES = API_KEY.encode() if API_KEY else None
+
+
+def is_valid_api_key(api_key: Optional[str]) -> bool:
+    """
+    Check whether the given value matches the configured API key.
+
+    The comparison is done with `hmac.compare_digest` so that it runs in constant time.
+
+    Parameters
+    ----------
+    api_key : str, optional
+        The API key to check
+
+    Returns
+    -------
+    bool
+        True if an API key is configured on the server and the value matches it, False otherwise
+    """
+    if _API_KEY_BYTES is None or api_key is None:
+        return False
+    key_bytes = api_key.encode()
+    return len(key_bytes) == len(_API_KEY_BYTES) and hmac.compare_digest(key_bytes, _API_KEY_BYTES)
+
+
 async def get_api_key(api_key_header: str = Security(api_key_header)):
     """
     Validate the API key from the request header.
@@ -21,18 +50,75 @@ async def get_api_key(api_key_header: str = Security(api_key_header)):
     Returns
     -------
     str
-        The validated API key
+        The validated API key, or None if no API key is configured on the server
         
     Raises
     ------
     HTTPException
-        If the API key is invalid
+        If the API key is missing or invalid
     """
-    if not API_KEY:
+    if _API_KEY_BYTES is None:
         return None
-    if api_key_header == API_KEY:
-        return api_key_header
-    raise HTTPException(
-        status_code=403,
-        detail="Invalid API key"
-    )
+    if not is_valid_api_key(api_key_header):
+        raise HTTPException(
+            status_code=403,
+            detail="Invalid API key"
+        )
+    return api_key_header
+
+
+class APIKeyRequiredError(Exception):
+    """Exception raised when a JSON response is requested without an API key."""
+
+
+async def require_api_key(api_key: Optional[str] = Depends(get_api_key)) -> str:
+    """
+    Require a validated API key for the request.
+
+    Parameters
+    ----------
+    api_key : str, optional
+        The validated API key, as returned by `get_api_key`.
+
+    Returns
+    -------
+    str
+        The validated API key
+
+    Raises
+    ------
+    APIKeyRequiredError
+        If no API key was provided
+    """
+    if not api_key:
+        raise APIKeyRequiredError
+    return api_key
+
+
+async def require_api_key_for_json(
+    response_type: str = Query("html", description="Response type: 'html' or 'json'"),
+    api_key: Optional[str] = Depends(get_api_key),
+) -> Optional[str]:
+    """
+    Require a validated API key when a JSON response is requested.
+
+    Parameters
+    ----------
+    response_type : str
+        The desired response type: 'html' or 'json'.
+    api_key : str, optional
+        The validated API key, as returned by `get_api_key`.
+
+    Returns
+    -------
+    str, optional
+        The validated API key, or None for HTML responses without one
+
+    Raises
+    ------
+    APIKeyRequiredError
+        If a JSON response is requested without an API key
+    """
+    if response_type == "json" and not api_key:
+        raise APIKeyRequiredError
+    return api_key
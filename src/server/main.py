@@ -6,26 +6,35 @@ from typing import Dict
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, Depends, HTTPException
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi.errors import RateLimitExceeded
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 from server.routers import download, dynamic, index
 from server.server_config import templates
-from server.server_utils import lifespan, limiter, rate_limit_exception_handler
-from server.auth import get_api_key
+from server.server_utils import (
+    ORJSONResponse,
+    api_key_required_exception_handler,
+    lifespan,
+    limiter,
+    rate_limit_exception_handler,
+)
+from server.auth import APIKeyRequiredError, get_api_key
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize the FastAPI application with lifespan
-app = FastAPI(lifespan=lifespan)
+# Initialize the FastAPI application with lifespan, serializing JSON responses with orjson
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app.state.limiter = limiter
 
 # Register the custom exception handler for rate limits
 app.add_exception_handler(RateLimitExceeded, rate_limit_exception_handler)
 
+# Register the custom exception handler for requests missing a required API key
+app.add_exception_handler(APIKeyRequiredError, api_key_required_exception_handler)
+
 
 # Mount static files dynamically to serve CSS, JS, and other static assets
 static_dir = Path(__file__).parent.parent / "static"
@@ -0,0 +1,33 @@
+""" Pydantic models for the request bodies accepted by the server. """
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class StatsRequest(BaseModel):
+    """Body of a `/stats` request."""
+
+    url: str
+
+
+class QueryForm(BaseModel):
+    """
+    Form submitted to run a query, parsed and validated in a single pass.
+
+    Attributes
+    ----------
+    input_text : str
+        The input text provided by the user, typically a Git repository URL or slug.
+    max_file_size : int
+        The position of the file size slider, representing the maximum file size in the query.
+    pattern_type : Literal["include", "exclude"]
+        The type of pattern used for the query.
+    pattern : str
+        The pattern string used in the query (default is "").
+    """
+
+    input_text: str
+    max_file_size: int
+    pattern_type: Literal["include", "exclude"]
+    pattern: str = ""
@@ -1,16 +1,252 @@
 """ Process a query by parsing input, cloning a repository, and generating a summary. """
 
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
 from functools import partial
+from typing import Dict, Optional, Tuple
 
 from fastapi import Request
 from starlette.templating import _TemplateResponse
 
 from gitingest.cloning import clone_repo
-from gitingest.ingestion import ingest_query
+from gitingest.ingestion import ingest_query, ingest_query_with_readme
 from gitingest.query_parsing import ParsedQuery, parse_query
-from server.server_config import EXAMPLE_REPOS, MAX_DISPLAY_SIZE, templates
+from server.server_config import (
+    EXAMPLE_REPOS,
+    INGEST_CACHE_MAX_CHARS,
+    INGEST_CACHE_SIZE,
+    INGEST_CACHE_TTL,
+    MAX_DISPLAY_SIZE,
+    templates,
+)
 from server.server_utils import Colors, log_slider_to_size
 
+IngestCacheKey = Tuple[str, Optional[str], Optional[str], Optional[int], bool]
+IngestResult = Tuple[str, str, Optional[str], str]
+
+
+@dataclass
+class _IngestCache:
+    """
+    Least recently used cache of ingest results, bounded in count and in total size.
+
+    Entries are keyed by (source, include patterns, ignore patterns, max file size, README only), oldest first,
+    and hold their expiry time, their size in characters and the result. `chars` is the total size of the entries.
+    """
+
+    entries: "OrderedDict[IngestCacheKey, Tuple[float, int, IngestResult]]" = field(default_factory=OrderedDict)
+    chars: int = 0
+
+    def get(self, key: IngestCacheKey) -> Optional[IngestResult]:
+        """
+        Return a cached ingest result and mark it as the most recently used, dropping it if it has expired.
+
+        Parameters
+        ----------
+        key : IngestCacheKey
+            The source, include patterns, ignore patterns, max file size and README-only flag of the ingestion.
+
+        Returns
+        -------
+        Optional[IngestResult]
+            The cached result, or None if there is no unexpired result for the key.
+        """
+        cached = self.entries.get(key)
+        if cached is None:
+            return None
+
+        expires_at, _, result = cached
+        if expires_at <= time.monotonic():
+            self.evict(key)
+            return None
+
+        self.entries.move_to_end(key)
+        return result
+
+    def store(self, key: IngestCacheKey, result: IngestResult) -> None:
+        """
+        Store an ingest result, evicting the least recently used ones to stay within the cache bounds.
+
+        Results larger than `INGEST_CACHE_MAX_CHARS` on their own are not stored.
+
+        Parameters
+        ----------
+        key : IngestCacheKey
+            The source, include patterns, ignore patterns, max file size and README-only flag of the ingestion.
+        result : IngestResult
+            The summary, directory structure, file contents (or README content) and ingest ID to store.
+        """
+        summary, tree, content, _ = result
+        size = len(summary) + len(tree) + len(content or "")
+        if size > INGEST_CACHE_MAX_CHARS:
+            return
+
+        if key in self.entries:
+            self.evict(key)
+        self.entries[key] = (time.monotonic() + INGEST_CACHE_TTL, size, result)
+        self.chars += size
+
+        while len(self.entries) > INGEST_CACHE_SIZE or self.chars > INGEST_CACHE_MAX_CHARS:
+            self.evict(next(iter(self.entries)))
+
+    def evict(self, key: IngestCacheKey) -> None:
+        """
+        Remove a cached ingest result and release its size from the cache total.
+
+        Parameters
+        ----------
+        key : IngestCacheKey
+            The key of the cached result to remove.
+        """
+        _, size, _ = self.entries.pop(key)
+        self.chars -= size
+
+    def clear(self) -> int:
+        """
+        Remove every cached ingest result.
+
+        Returns
+        -------
+        int
+            The number of removed entries.
+        """
+        count = len(self.entries)
+        self.entries.clear()
+        self.chars = 0
+        return count
+
+
+_ingest_cache = _IngestCache()
+
+# Ingestions currently running, so that identical concurrent requests share a single clone
+_inflight_ingests: "Dict[IngestCacheKey, asyncio.Future[IngestResult]]" = {}
+
+
+async def ingest_with_cache(
+    source: str,
+    include_patterns: Optional[str],
+    ignore_patterns: Optional[str],
+    max_file_size: Optional[int],
+    clone_semaphore: asyncio.Semaphore,
+    readme_only: bool = False,
+    ingest_executor: Optional[Executor] = None,
+) -> IngestResult:
+    """
+    Parse, clone and ingest a repository, reusing recent results for identical requests.
+
+    Results are kept for `INGEST_CACHE_TTL` seconds, and at most `INGEST_CACHE_SIZE` of them, holding at most
+    `INGEST_CACHE_MAX_CHARS` characters in total, are kept, evicting the least recently used first. Failures
+    and results larger than `INGEST_CACHE_MAX_CHARS` are not cached. Identical requests arriving while
+    an ingestion is running wait for that ingestion instead of starting their own.
+
+    Parameters
+    ----------
+    source : str
+        The repository URL or slug to ingest.
+    include_patterns : str, optional
+        Patterns to include in the ingestion.
+    ignore_patterns : str, optional
+        Patterns to ignore in the ingestion.
+    max_file_size : int, optional
+        The maximum file size in bytes to include, or None for no limit.
+    clone_semaphore : asyncio.Semaphore
+        The semaphore bounding the number of clones running at once, held while cloning.
+    readme_only : bool
+        Whether to read the root README as the only file content, see `ingest_query_with_readme`
+        (default is False).
+    ingest_executor : Executor, optional
+        The executor running the ingestion off the event loop (default is the event loop's default executor).
+
+    Returns
+    -------
+    IngestResult
+        A tuple containing the summary, directory structure, file contents (or README content) and ingest ID.
+
+    Raises
+    ------
+    ValueError
+        If the parsed query does not contain a URL.
+    """
+    key = (source, include_patterns, ignore_patterns, max_file_size, readme_only)
+
+    cached = _ingest_cache.get(key)
+    if cached is not None:
+        return cached
+
+    inflight = _inflight_ingests.get(key)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_ingest(key, clone_semaphore, ingest_executor))
+        _inflight_ingests[key] = inflight
+        inflight.add_done_callback(lambda _: _inflight_ingests.pop(key, None))
+
+    # Shield the shared ingestion so that a cancelled request does not cancel it for the others
+    return await asyncio.shield(inflight)
+
+
+async def _ingest(
+    key: IngestCacheKey,
+    clone_semaphore: asyncio.Semaphore,
+    ingest_executor: Optional[Executor],
+) -> IngestResult:
+    """
+    Parse, clone and ingest a repository, then store the result in the ingest cache.
+
+    Parameters
+    ----------
+    key : IngestCacheKey
+        The source, include patterns, ignore patterns, max file size and README-only flag of the ingestion.
+    clone_semaphore : asyncio.Semaphore
+        The semaphore bounding the number of clones running at once, held while cloning.
+    ingest_executor : Executor, optional
+        The executor running the ingestion off the event loop, or None for the event loop's default executor.
+
+    Returns
+    -------
+    IngestResult
+        A tuple containing the summary, directory structure, file contents (or README content) and ingest ID.
+
+    Raises
+    ------
+    ValueError
+        If the parsed query does not contain a URL.
+    """
+    source, include_patterns, ignore_patterns, max_file_size, readme_only = key
+    parsed_query = await parse_query(
+        source=source,
+        max_file_size=max_file_size,
+        from_web=True,
+        include_patterns=include_patterns,
+        ignore_patterns=ignore_patterns,
+    )
+    if not parsed_query.url:
+        raise ValueError("The 'url' parameter is required.")
+
+    clone_config = parsed_query.extact_clone_config()
+    async with clone_semaphore:
+        await clone_repo(clone_config)
+    ingest = ingest_query_with_readme if readme_only else ingest_query
+    loop = asyncio.get_running_loop()
+    summary, tree, content = await loop.run_in_executor(ingest_executor, ingest, parsed_query)
+    result = (summary, tree, content, parsed_query.id)
+
+    _ingest_cache.store(key, result)
+    return result
+
+
+def clear_ingest_cache() -> int:
+    """
+    Remove every cached ingest result.
+
+    Returns
+    -------
+    int
+        The number of removed entries.
+    """
+    return _ingest_cache.clear()
+
 
 async def process_query(
     request: Request,
@@ -73,8 +309,9 @@ async def process_query(
         "pattern": pattern,
     }
 
+    parsed_query: Optional[ParsedQuery] = None
     try:
-        parsed_query: ParsedQuery = await parse_query(
+        parsed_query = await parse_query(
             source=input_text,
             max_file_size=max_file_size,
             from_web=True,
@@ -85,14 +322,18 @@ async def process_query(
             raise ValueError("The 'url' parameter is required.")
 
         clone_config = parsed_query.extact_clone_config()
-        await clone_repo(clone_config)
-        summary, tree, content = ingest_query(parsed_query)
+        async with request.app.state.clone_semaphore:
+            await clone_repo(clone_config)
+        loop = asyncio.get_running_loop()
+        summary, tree, content = await loop.run_in_executor(
+            request.app.state.ingest_executor, ingest_query, parsed_query
+        )
         with open(f"{clone_config.local_path}.txt", "w", encoding="utf-8") as f:
             f.write(tree + "\n" + content)
     except Exception as exc:
-        # hack to print error message when query is not defined
-        if "query" in locals() and parsed_query is not None and isinstance(parsed_query, dict):
-            _print_error(parsed_query["url"], exc, max_file_size, pattern_type, pattern)
+        # Print the query details only if parsing got far enough to produce a URL
+        if parsed_query is not None and parsed_query.url:
+            _print_error(parsed_query.url, exc, max_file_size, pattern_type, pattern)
         else:
             print(f"{Colors.BROWN}WARN{Colors.END}: {Colors.RED}<-  {Colors.END}", end="")
             print(f"{Colors.RED}{exc}{Colors.END}")
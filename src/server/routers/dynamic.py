@@ -1,26 +1,38 @@
 """ This module defines the dynamic router for handling dynamic path requests. """
 
 from typing import Dict, Any
-from pydantic import BaseModel
 from fastapi import APIRouter, Form, Request, Depends, Query, Body
-from fastapi.responses import HTMLResponse, JSONResponse
-from server.auth import get_api_key
+from fastapi.responses import HTMLResponse
+from server.auth import require_api_key, require_api_key_for_json
+from server.models import QueryForm, StatsRequest
 
-from server.query_processor import process_query, parse_query, ingest_query, clone_repo
+from server.query_processor import clear_ingest_cache, ingest_with_cache, process_query
 from server.server_config import templates
-from server.server_utils import limiter
+from server.server_utils import (
+    ORJSONResponse,
+    clone_slot,
+    get_api_key_and_remote_address,
+    ingest_error_response,
+    limiter,
+)
 
 router = APIRouter()
 
-class StatsRequest(BaseModel):
-    url: str
+# Context shared by every dynamic-path GET; only `repo_url` varies per request
+_STATIC_CTX = {"loading": True, "default_file_size": 243}
 
-@router.post("/stats", response_model=None)
+_GIT_TEMPLATE = templates.get_template("git.jinja")
+
+# Shape of a successful /stats response, copied and filled in per request
+_STATS_RESPONSE = {"status": "success", "repository": None, "summary": None, "tree": None, "readme_content": None}
+
+
+@router.post("/stats", response_model=None, dependencies=[Depends(require_api_key)])
+@limiter.limit("10/minute", key_func=get_api_key_and_remote_address)
 async def get_repository_stats(
     request: Request,
     body: StatsRequest,
     include_readme: bool = Query(True, description="Include README.md content in the response"),
-    api_key: str = Depends(get_api_key)
 ):
     """
     Get repository statistics and directory tree structure.
@@ -36,66 +48,55 @@ async def get_repository_stats(
         The request body containing the repository URL.
     include_readme : bool
         Whether to include README.md content in the response.
-    api_key : str
-        API key for authentication.
 
     Returns
     -------
-    JSONResponse
+    ORJSONResponse
         Repository statistics and tree structure
     """
-    if not api_key:
-        return JSONResponse(
-            status_code=403,
-            content={"error": "API key required for JSON responses"}
-        )
-        
-    try:
-        # Parse query with README-only pattern if needed
-        include_patterns = "README.md" if include_readme else None
-            
-        parsed_query = await parse_query(
-            source=body.url,
-            max_file_size=float('inf'),  # No file size limit for tree structure
-            from_web=True,
-            include_patterns=include_patterns,
-            ignore_patterns=None  # Allow directory traversal but only include README if requested
-        )
-        
-        if not parsed_query.url:
-            raise ValueError("The 'url' parameter is required.")
-
-        clone_config = parsed_query.extact_clone_config()
-        await clone_repo(clone_config)
-        summary, tree, content = ingest_query(parsed_query)
-        
-        return JSONResponse(content={
-            "status": "success",
-            "repository": body.url,
-            "summary": summary,
-            "tree": tree,
-            "readme_content": content if include_readme else None
-        })
+    async with clone_slot(request):
+        try:
+            # Walk the whole tree, reading the README as the only file content
+            summary, tree, content, _ = await ingest_with_cache(
+                source=body.url,
+                include_patterns=None,
+                ignore_patterns=None,
+                max_file_size=None,  # No file size limit for tree structure
+                clone_semaphore=request.app.state.clone_semaphore,
+                readme_only=True,
+                ingest_executor=request.app.state.ingest_executor,
+            )
+
+            response = _STATS_RESPONSE.copy()
+            response["repository"] = body.url
+            response["summary"] = summary
+            response["tree"] = tree
+            if include_readme:
+                response["readme_content"] = content
+            return ORJSONResponse(content=response)
             
-    except Exception as exc:
-        error_message = str(exc)
-        if "405" in error_message:
-            error_message = "Repository not found. Please make sure it is public (private repositories will be supported soon)"
-        
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": "error",
-                "error": error_message
-            }
-        )
-
-@router.get("/{full_path:path}", response_model=None)
+        except Exception as exc:
+            return ingest_error_response(exc)
+
+
+@router.delete("/cache", dependencies=[Depends(require_api_key)])
+async def purge_cache() -> Dict[str, Any]:
+    """
+    Remove every cached ingest result so that subsequent JSON requests clone the repositories again.
+
+    Returns
+    -------
+    Dict[str, Any]
+        A JSON object with the number of purged entries.
+    """
+    return {"status": "success", "purged": clear_ingest_cache()}
+
+
+@router.get("/{full_path:path}", response_model=None, dependencies=[Depends(require_api_key_for_json)])
 async def catch_all(
     request: Request, 
     full_path: str,
     response_type: str = Query("html", description="Response type: 'html' or 'json'"),
-    api_key: str = Depends(get_api_key)
 ):
     """
     Render a page or return JSON with a Git URL based on the provided path.
@@ -111,103 +112,65 @@ async def catch_all(
     full_path : str
         The full path extracted from the URL, which is used to build the Git URL.
     response_type : str
-        The desired response type: 'html' or 'json'.
-    api_key : str
-        Optional API key for authentication when requesting JSON response.
+        The desired response type: 'html' or 'json'. JSON responses require an API key.
 
     Returns
     -------
-    HTMLResponse or JSONResponse
+    HTMLResponse or ORJSONResponse
         Either an HTML response containing the rendered template, or a JSON response
         containing the Git URL and metadata.
     """
-    data = {
-        "repo_url": full_path,
-        "loading": True,
-        "default_file_size": 243,
-    }
-    
     if response_type == "json":
-        if not api_key:
-            return JSONResponse(
-                status_code=403,
-                content={"error": "API key required for JSON responses"}
-            )
-        return JSONResponse(content=data)
+        return ORJSONResponse(content={"repo_url": full_path, **_STATIC_CTX})
     
-    return templates.TemplateResponse(
-        "git.jinja",
-        {
-            "request": request,
-            **data
-        },
-    )
+    # Jinja merges the positional context and the keyword arguments into its own dict, so no copy is built here
+    return HTMLResponse(_GIT_TEMPLATE.render(_STATIC_CTX, request=request, repo_url=full_path))
 
 
-@router.post("/{full_path:path}", response_model=None)
+@router.post("/{full_path:path}", response_model=None, dependencies=[Depends(require_api_key_for_json)])
 @limiter.limit("10/minute")
 async def process_catch_all(
     request: Request,
-    input_text: str = Form(...),
-    max_file_size: int = Form(...),
-    pattern_type: str = Form(...),
-    pattern: str = Form(...),
+    form: QueryForm = Form(),
     response_type: str = Query("html", description="Response type: 'html' or 'json'"),
-    api_key: str = Depends(get_api_key)
 ):
     """
     Process the form submission with user input for query parameters.
 
     This endpoint handles POST requests, processes the input parameters (e.g., text, file size, pattern),
-    and calls the `process_query` function to handle the query logic, returning the result as HTML or JSON.
+    and calls the `process_query` function to handle the query logic, returning the result as HTML.
+    JSON responses only echo the form input back, without running the query.
 
     Parameters
     ----------
     request : Request
         The incoming request object, which provides context for rendering the response.
-    input_text : str
-        The input text provided by the user for processing, by default taken from the form.
-    max_file_size : int
-        The maximum allowed file size for the input, specified by the user.
-    pattern_type : str
-        The type of pattern used for the query, specified by the user.
-    pattern : str
-        The pattern string used in the query, specified by the user.
+    form : QueryForm
+        The submitted form: input text, maximum file size, pattern type and pattern.
     response_type : str
-        The desired response type: 'html' or 'json'.
-    api_key : str
-        Optional API key for authentication when requesting JSON response.
+        The desired response type: 'html' or 'json'. JSON responses require an API key.
 
     Returns
     -------
-    HTMLResponse or JSONResponse
-        Either an HTML response or JSON response after processing the form input and query logic.
+    HTMLResponse or ORJSONResponse
+        Either an HTML response after processing the form input and query logic, or a JSON response
+        echoing the form input.
     """
     if response_type == "json":
-        if not api_key:
-            return JSONResponse(
-                status_code=403,
-                content={"error": "API key required for JSON responses"}
-            )
-    
-    result = await process_query(
+        # The JSON response only echoes the form input, so skip the ingestion entirely
+        return ORJSONResponse(content={
+            "input_text": form.input_text,
+            "max_file_size": form.max_file_size,
+            "pattern_type": form.pattern_type,
+            "pattern": form.pattern,
+            "status": "success"
+        })
+
+    return await process_query(
         request,
-        input_text,
-        max_file_size,
-        pattern_type,
-        pattern,
+        form.input_text,
+        form.max_file_size,
+        form.pattern_type,
+        form.pattern,
         is_index=False,
     )
-    
-    if response_type == "json":
-        # Extract data from the HTML response and return as JSON
-        if isinstance(result, HTMLResponse):
-            return JSONResponse(content={
-                "input_text": input_text,
-                "max_file_size": max_file_size,
-                "pattern_type": pattern_type,
-                "pattern": pattern,
-                "status": "success"
-            })
-    
-    return result
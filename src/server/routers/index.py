@@ -1,15 +1,47 @@
 """ This module defines the index router for handling the home page and its functionality. """
 
+from collections import OrderedDict
+
 from fastapi import APIRouter, Form, Request, Depends, Query
-from fastapi.responses import HTMLResponse, JSONResponse
-from server.auth import get_api_key
+from fastapi.responses import HTMLResponse
+from server.auth import require_api_key_for_json
+from server.models import QueryForm
 
-from server.query_processor import process_query, parse_query, ingest_query, clone_repo
+from server.query_processor import ingest_with_cache, process_query
 from server.server_config import templates, EXAMPLE_REPOS
-from server.server_utils import limiter, log_slider_to_size
+from server.server_utils import (
+    clone_slot,
+    get_api_key_and_remote_address,
+    ingest_error_response,
+    limiter,
+    log_slider_to_size,
+    stream_json_with_content,
+)
 
 router = APIRouter()
 
+# Whether the submitted pattern is used as (include patterns, exclude patterns) for each `QueryForm.pattern_type`
+_PATTERN_DISPATCH = {"include": (True, False), "exclude": (False, True)}
+
+# Rendered home pages keyed by request URL, least recently used first;
+# the template only depends on the request through `request.url`
+_HOME_HTML: "OrderedDict[str, bytes]" = OrderedDict()
+_HOME_HTML_MAX_ENTRIES = 64
+
+_INDEX_TEMPLATE = templates.get_template("index.jinja")
+
+# Shape of the metadata of a successful JSON response, copied and filled in per request
+_JSON_RESPONSE = {
+    "status": "success",
+    "input_text": None,
+    "max_file_size": None,
+    "pattern_type": None,
+    "pattern": None,
+    "summary": None,
+    "tree": None,
+    "ingest_id": None,
+}
+
 
 @router.get("/", response_class=HTMLResponse)
 async def home(request: Request) -> HTMLResponse:
@@ -18,6 +50,8 @@ async def home(request: Request) -> HTMLResponse:
 
     This endpoint serves the home page of the application, rendering the `index.jinja` template
     and providing it with a list of example repositories and default file size values.
+    The context is constant, so the rendered page is cached per request URL and served as-is afterwards,
+    keeping the `_HOME_HTML_MAX_ENTRIES` most recently used URLs.
 
     Parameters
     ----------
@@ -30,26 +64,26 @@ async def home(request: Request) -> HTMLResponse:
         An HTML response containing the rendered home page template, with example repositories
         and other default parameters such as file size.
     """
-    return templates.TemplateResponse(
-        "index.jinja",
-        {
-            "request": request,
-            "examples": EXAMPLE_REPOS,
-            "default_file_size": 243,
-        },
-    )
+    page_url = str(request.url)
+    html = _HOME_HTML.get(page_url)
+    if html is not None:
+        _HOME_HTML.move_to_end(page_url)
+    else:
+        context = {"request": request, "examples": EXAMPLE_REPOS, "default_file_size": 243}
+        html = _INDEX_TEMPLATE.render(context).encode("utf-8")
+        _HOME_HTML[page_url] = html
+        if len(_HOME_HTML) > _HOME_HTML_MAX_ENTRIES:
+            _HOME_HTML.popitem(last=False)
 
+    return HTMLResponse(content=html)
 
-@router.post("/", response_model=None)
-@limiter.limit("10/minute")
+
+@router.post("/", response_model=None, dependencies=[Depends(require_api_key_for_json)])
+@limiter.limit("10/minute", key_func=get_api_key_and_remote_address)
 async def index_post(
     request: Request,
-    input_text: str = Form(...),
-    max_file_size: int = Form(...),
-    pattern_type: str = Form(...),
-    pattern: str = Form(...),
+    form: QueryForm = Form(),
     response_type: str = Query("html", description="Response type: 'html' or 'json'"),
-    api_key: str = Depends(get_api_key)
 ):
     """
     Process the form submission with user input for query parameters.
@@ -62,89 +96,53 @@ async def index_post(
     ----------
     request : Request
         The incoming request object, which provides context for rendering the response.
-    input_text : str
-        The input text provided by the user for processing, by default taken from the form.
-    max_file_size : int
-        The maximum allowed file size for the input, specified by the user.
-    pattern_type : str
-        The type of pattern used for the query, specified by the user.
-    pattern : str
-        The pattern string used in the query, specified by the user.
+    form : QueryForm
+        The submitted form: input text, maximum file size, pattern type and pattern.
     response_type : str
-        The desired response type: 'html' or 'json'.
-    api_key : str
-        Optional API key for authentication when requesting JSON response.
+        The desired response type: 'html' or 'json'. JSON responses require an API key.
 
     Returns
     -------
-    HTMLResponse or JSONResponse
+    HTMLResponse, StreamingResponse or ORJSONResponse
         Either an HTML response containing the results of processing the form input and query logic,
-        or a JSON response containing the processed data.
+        a streamed JSON response containing the processed data, or a JSON error response.
     """
     if response_type == "json":
-        if not api_key:
-            return JSONResponse(
-                status_code=403,
-                content={"error": "API key required for JSON responses"}
-            )
-            
-        try:
-            # Process the query directly for JSON response
-            if pattern_type == "include":
-                include_patterns = pattern
-                exclude_patterns = None
-            elif pattern_type == "exclude":
-                exclude_patterns = pattern
-                include_patterns = None
-            else:
-                raise ValueError(f"Invalid pattern type: {pattern_type}")
-
-            parsed_query = await parse_query(
-                source=input_text,
-                max_file_size=log_slider_to_size(max_file_size),
-                from_web=True,
-                include_patterns=include_patterns,
-                ignore_patterns=exclude_patterns,
-            )
-            
-            if not parsed_query.url:
-                raise ValueError("The 'url' parameter is required.")
+        async with clone_slot(request):
+            try:
+                # Process the query directly for JSON response
+                is_include, is_exclude = _PATTERN_DISPATCH[form.pattern_type]
+                include_patterns = form.pattern if is_include else None
+                exclude_patterns = form.pattern if is_exclude else None
 
-            clone_config = parsed_query.extact_clone_config()
-            await clone_repo(clone_config)
-            summary, tree, content = ingest_query(parsed_query)
-            
-            return JSONResponse(content={
-                "status": "success",
-                "input_text": input_text,
-                "max_file_size": max_file_size,
-                "pattern_type": pattern_type,
-                "pattern": pattern,
-                "summary": summary,
-                "tree": tree,
-                "content": content,
-                "ingest_id": parsed_query.id
-            })
-            
-        except Exception as exc:
-            error_message = str(exc)
-            if "405" in error_message:
-                error_message = "Repository not found. Please make sure it is public (private repositories will be supported soon)"
+                summary, tree, content, ingest_id = await ingest_with_cache(
+                    source=form.input_text,
+                    include_patterns=include_patterns,
+                    ignore_patterns=exclude_patterns,
+                    max_file_size=log_slider_to_size(form.max_file_size),
+                    clone_semaphore=request.app.state.clone_semaphore,
+                    ingest_executor=request.app.state.ingest_executor,
+                )
+
+                response = _JSON_RESPONSE.copy()
+                response["input_text"] = form.input_text
+                response["max_file_size"] = form.max_file_size
+                response["pattern_type"] = form.pattern_type
+                response["pattern"] = form.pattern
+                response["summary"] = summary
+                response["tree"] = tree
+                response["ingest_id"] = ingest_id
+                return stream_json_with_content(response, content)
             
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "status": "error",
-                    "error": error_message
-                }
-            )
+            except Exception as exc:
+                return ingest_error_response(exc)
     
     # For HTML responses, use the existing process_query function
     return await process_query(
         request,
-        input_text,
-        max_file_size,
-        pattern_type,
-        pattern,
+        form.input_text,
+        form.max_file_size,
+        form.pattern_type,
+        form.pattern,
         is_index=True,
     )
@@ -1,11 +1,21 @@
 """ Configuration for the server. """
 
+import os
+from pathlib import Path
 from typing import Dict, List
 
 from fastapi.templating import Jinja2Templates
 
 MAX_DISPLAY_SIZE: int = 300_000
 DELETE_REPO_AFTER: int = 60 * 60  # In seconds
+MAX_CONCURRENT_CLONES: int = 2  # Per rate-limit key
+MAX_RUNNING_CLONES: int = (os.cpu_count() or 1) * 2  # Across the whole server process
+INGEST_WORKERS: int = (os.cpu_count() or 1) * 2  # Threads running ingest_query off the event loop
+CLONE_RETRY_AFTER: int = 10  # In seconds, sent back when MAX_CONCURRENT_CLONES is reached
+INGEST_CACHE_SIZE: int = 256  # Maximum number of cached ingest results
+INGEST_CACHE_MAX_CHARS: int = 200_000_000  # Maximum total characters held by cached ingest results
+INGEST_CACHE_TTL: int = 5 * 60  # In seconds
+STREAM_CHUNK_SIZE: int = 64 * 1024  # In characters, for streamed JSON content
 
 
 EXAMPLE_REPOS: List[Dict[str, str]] = [
@@ -16,4 +26,6 @@ EXAMPLE_REPOS: List[Dict[str, str]] = [
     {"name": "ApiAnalytics", "url": "https://github.com/tom-draper/api-analytics"},
 ]
 
-templates = Jinja2Templates(directory="server/templates")
+templates = Jinja2Templates(directory=Path(__file__).parent / "templates")
+# Templates do not change while the server runs, so skip the modification check on every lookup
+templates.env.auto_reload = False
@@ -1,24 +1,113 @@
 """ Utility functions for the server. """
 
 import asyncio
+import hashlib
 import math
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator
 
-from fastapi import FastAPI, Request
-from fastapi.responses import Response
+import orjson
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
 from gitingest.config import TMP_BASE_PATH
-from server.server_config import DELETE_REPO_AFTER
+from server.auth import API_KEY_NAME, APIKeyRequiredError, is_valid_api_key
+from server.server_config import (
+    CLONE_RETRY_AFTER,
+    DELETE_REPO_AFTER,
+    INGEST_WORKERS,
+    MAX_CONCURRENT_CLONES,
+    MAX_RUNNING_CLONES,
+    STREAM_CHUNK_SIZE,
+)
 
 # Initialize a rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+# Number of clones currently running for each rate-limit key
+_active_clones: Dict[str, int] = {}
+
+# Pre-serialized body of the 403 response returned when a JSON response is requested without an API key
+_API_KEY_REQUIRED_BODY = b'{"error":"API key required for JSON responses"}'
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson, which is much faster than `json` on large strings."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def get_api_key_and_remote_address(request: Request) -> str:
+    """
+    Build the rate-limit key of a request from its API key and client address.
+
+    Requests carrying a valid API key are tracked separately from anonymous requests of the same client.
+    The API key is hashed so that it is never stored in the rate limiter.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming HTTP request.
+
+    Returns
+    -------
+    str
+        The rate-limit key for the request.
+    """
+    remote_address = get_remote_address(request)
+    api_key = request.headers.get(API_KEY_NAME)
+    if not is_valid_api_key(api_key):
+        return remote_address
+
+    key_digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return f"{key_digest}:{remote_address}"
+
+
+@asynccontextmanager
+async def clone_slot(request: Request) -> AsyncIterator[None]:
+    """
+    Reserve one of the concurrent clone slots of the client for the duration of the block.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming HTTP request, used to derive the rate-limit key of the client.
+
+    Yields
+    -------
+    None
+        Yields control back to the caller while the slot is held.
+
+    Raises
+    ------
+    HTTPException
+        If the client already has `MAX_CONCURRENT_CLONES` clones running.
+    """
+    key = get_api_key_and_remote_address(request)
+    active = _active_clones.get(key, 0)
+    if active >= MAX_CONCURRENT_CLONES:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many concurrent requests, at most {MAX_CONCURRENT_CLONES} are allowed",
+            headers={"Retry-After": str(CLONE_RETRY_AFTER)},
+        )
+
+    _active_clones[key] = active + 1
+    try:
+        yield
+    finally:
+        _active_clones[key] -= 1
+        if not _active_clones[key]:
+            del _active_clones[key]
+
 
 async def rate_limit_exception_handler(request: Request, exc: Exception) -> Response:
     """
@@ -48,30 +137,131 @@ async def rate_limit_exception_handler(request: Request, exc: Exception) -> Resp
     raise exc
 
 
+async def api_key_required_exception_handler(request: Request, exc: Exception) -> Response:
+    """
+    Custom exception handler for requests that need an API key but did not provide one.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming HTTP request.
+    exc : Exception
+        The exception raised, expected to be APIKeyRequiredError.
+
+    Returns
+    -------
+    Response
+        A 403 response indicating that an API key is required.
+
+    Raises
+    ------
+    exc
+        If the exception is not an APIKeyRequiredError, it is re-raised.
+    """
+    if isinstance(exc, APIKeyRequiredError):
+        return api_key_required()
+    # Re-raise other exceptions
+    raise exc
+
+
+def api_key_required() -> Response:
+    """
+    Build the 403 response returned when a JSON response is requested without an API key.
+
+    Returns
+    -------
+    Response
+        A JSON response with status code 403 and a pre-serialized error body.
+    """
+    return Response(content=_API_KEY_REQUIRED_BODY, status_code=403, media_type="application/json")
+
+
+def ingest_error_response(exc: Exception) -> ORJSONResponse:
+    """
+    Build the 400 JSON response returned when a JSON ingestion fails.
+
+    Parameters
+    ----------
+    exc : Exception
+        The exception raised while parsing, cloning or ingesting the repository.
+
+    Returns
+    -------
+    ORJSONResponse
+        A JSON response with status code 400 describing the error.
+    """
+    error_message = str(exc)
+    if "405" in error_message:
+        error_message = (
+            "Repository not found. Please make sure it is public (private repositories will be supported soon)"
+        )
+
+    return ORJSONResponse(status_code=400, content={"status": "error", "error": error_message})
+
+
+def stream_json_with_content(payload: Dict[str, Any], content: str) -> StreamingResponse:
+    """
+    Stream a JSON object made of `payload` followed by a large `content` string field.
+
+    The metadata in `payload` is serialized first, then `content` is escaped and sent in chunks of
+    `STREAM_CHUNK_SIZE` characters, so the full serialized document is never built in memory.
+
+    Parameters
+    ----------
+    payload : Dict[str, Any]
+        The JSON-serializable fields sent before the content.
+    content : str
+        The value of the trailing "content" field.
+
+    Returns
+    -------
+    StreamingResponse
+        A streaming response with the `application/json` media type.
+    """
+
+    def _generate() -> Iterator[bytes]:
+        # Drop the closing brace so the content field can be appended to the object
+        yield orjson.dumps(payload)[:-1]
+        yield b',"content":"' if payload else b'"content":"'
+        for start in range(0, len(content), STREAM_CHUNK_SIZE):
+            # Strip the surrounding quotes of each escaped chunk
+            yield orjson.dumps(content[start : start + STREAM_CHUNK_SIZE])[1:-1]
+        yield b'"}'
+
+    return StreamingResponse(_generate(), media_type="application/json")
+
+
 @asynccontextmanager
-async def lifespan(_: FastAPI):
+async def lifespan(app: FastAPI):
     """
     Lifecycle manager for handling startup and shutdown events for the FastAPI application.
 
+    On startup, a semaphore bounding the number of clones running at once is attached to `app.state.clone_semaphore`,
+    and a thread pool running the ingestions off the event loop to `app.state.ingest_executor`, so that both are
+    shared by every request.
+
     Parameters
     ----------
-    _ : FastAPI
-        The FastAPI application instance (unused).
+    app : FastAPI
+        The FastAPI application instance.
 
     Yields
     -------
     None
         Yields control back to the FastAPI application while the background task runs.
     """
+    app.state.clone_semaphore = asyncio.Semaphore(MAX_RUNNING_CLONES)
+    app.state.ingest_executor = ThreadPoolExecutor(max_workers=INGEST_WORKERS, thread_name_prefix="ingest")
     task = asyncio.create_task(_remove_old_repositories())
 
     yield
-    # Cancel the background task on shutdown
+    # Cancel the background task and release the ingest threads on shutdown
     task.cancel()
     try:
         await task
     except asyncio.CancelledError:
         pass
+    app.state.ingest_executor.shutdown(wait=False)
 
 
 async def _remove_old_repositories():
@@ -1,21 +1,32 @@
 """
 Fixtures for tests.
 
-This file provides shared fixtures for creating sample queries, a temporary directory structure, and a helper function
-to write `.ipynb` notebooks for testing notebook utilities.
+This file provides shared fixtures for creating sample queries, a temporary directory structure, a helper function
+to write `.ipynb` notebooks for testing notebook utilities, and a client for the server.
 """
 
+import asyncio
 import json
 from pathlib import Path
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
 
 import pytest
+from fastapi.testclient import TestClient
 
 from gitingest.query_parsing import ParsedQuery
+from server import query_processor
+from server.main import app
 
 WriteNotebookFunc = Callable[[str, Dict[str, Any]], Path]
 
 
+class StubbedIngestion(NamedTuple):
+    """The clone calls recorded by the `stubbed_ingestion` fixture, and the semaphore to pass to the ingestion."""
+
+    clone_calls: List[Any]
+    clone_semaphore: asyncio.Semaphore
+
+
 @pytest.fixture
 def sample_query() -> ParsedQuery:
     """
@@ -130,3 +141,57 @@ def write_notebook(tmp_path: Path) -> WriteNotebookFunc:
         return notebook_path
 
     return _write_notebook
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    """
+    Provide a test client for the server, sending requests to an allowed host.
+
+    Yields
+    ------
+    TestClient
+        The test client, with the server lifespan running.
+    """
+    with TestClient(app) as test_client:
+        test_client.headers.update({"Host": "localhost"})
+        yield test_client
+
+
+@pytest.fixture
+def stubbed_ingestion(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> StubbedIngestion:
+    """
+    Stub out the parsing, cloning and ingestion used by `query_processor.ingest_with_cache`, with an empty cache.
+
+    Each source is parsed into `sample_query` with its slug set to the source, every clone is recorded and yields to
+    the event loop before returning, and every ingestion returns ("summary", "tree", "content").
+
+    Parameters
+    ----------
+    request : pytest.FixtureRequest
+        The fixture request, used to get the `sample_query` returned for every parsed source.
+    monkeypatch : pytest.MonkeyPatch
+        The monkeypatch fixture used to install the stubs.
+
+    Returns
+    -------
+    StubbedIngestion
+        The list of recorded clone configurations, and a semaphore allowing a single clone at once.
+    """
+    query: ParsedQuery = request.getfixturevalue("sample_query")
+    query.url = "https://github.com/test_user/test_repo"
+    clone_calls: List[Any] = []
+
+    async def fake_parse_query(source: str, **_: Any) -> ParsedQuery:
+        query.slug = source
+        return query
+
+    async def fake_clone_repo(config: Any) -> None:
+        clone_calls.append(config)
+        await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(query_processor, "_ingest_cache", query_processor._IngestCache())
+    monkeypatch.setattr(query_processor, "parse_query", fake_parse_query)
+    monkeypatch.setattr(query_processor, "clone_repo", fake_clone_repo)
+    monkeypatch.setattr(query_processor, "ingest_query", lambda _: ("summary", "tree", "content"))
+    return StubbedIngestion(clone_calls=clone_calls, clone_semaphore=asyncio.Semaphore(1))
@@ -0,0 +1,82 @@
+"""Tests for the API key validation dependency."""
+
+import inspect
+
+import pytest
+from fastapi import HTTPException
+
+from server import auth
+
+
+async def test_get_api_key_without_configured_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test `get_api_key` when the server has no API key configured.
+    Given no configured API key:
+    When `get_api_key` is called with any header value,
+    Then it should return None.
+    """
+    monkeypatch.setattr(auth, "_API_KEY_BYTES", None)
+
+    assert await auth.get_api_key("anything") is None
+    assert await auth.get_api_key(None) is None
+
+
+async def test_get_api_key_valid(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test `get_api_key` with a matching API key.
+    Given a configured API key:
+    When `get_api_key` is called with the same key,
+    Then it should return the key.
+    """
+    monkeypatch.setattr(auth, "_API_KEY_BYTES", b"secret")
+
+    assert await auth.get_api_key("secret") == "secret"
+
+
+@pytest.mark.parametrize("header", [None, "", "secreT", "secret-but-longer"])
+async def test_get_api_key_invalid(monkeypatch: pytest.MonkeyPatch, header: str) -> None:
+    """
+    Test `get_api_key` with a missing or mismatching API key.
+    Given a configured API key:
+    When `get_api_key` is called with a missing, empty, or wrong key,
+    Then it should raise an HTTPException with status 403.
+    """
+    monkeypatch.setattr(auth, "_API_KEY_BYTES", b"secret")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await auth.get_api_key(header)
+
+    assert exc_info.value.status_code == 403
+
+
+def test_get_api_key_is_async() -> None:
+    """
+    Test that `get_api_key` is a coroutine function.
+    Given the `get_api_key` dependency:
+    When inspecting it,
+    Then it should be a coroutine function, so FastAPI awaits it instead of dispatching it to the threadpool.
+    """
+    assert inspect.iscoroutinefunction(auth.get_api_key)
+
+
+@pytest.mark.parametrize(
+    "response_type, api_key, should_raise",
+    [
+        ("html", None, False),
+        ("html", "secret", False),
+        ("json", "secret", False),
+        ("json", None, True),
+    ],
+)
+async def test_require_api_key_for_json(response_type: str, api_key: str, should_raise: bool) -> None:
+    """
+    Test `require_api_key_for_json` for each combination of response type and API key.
+    Given a response type and an optional validated API key:
+    When `require_api_key_for_json` is called,
+    Then it should only raise `APIKeyRequiredError` for JSON responses without an API key.
+    """
+    if should_raise:
+        with pytest.raises(auth.APIKeyRequiredError):
+            await auth.require_api_key_for_json(response_type, api_key)
+    else:
+        assert await auth.require_api_key_for_json(response_type, api_key) == api_key
@@ -6,8 +6,13 @@ including filtering patterns and subpaths.
 """
 
 from pathlib import Path
+from typing import Optional
 
-from gitingest.ingestion import ingest_query
+import pytest
+
+from gitingest import output_formatters
+from gitingest.filesystem_schema import FileSystemNode, FileSystemNodeType, FileSystemStats
+from gitingest.ingestion import _process_node, ingest_query, ingest_query_with_readme
 from gitingest.query_parsing import ParsedQuery
 
 
@@ -39,6 +44,82 @@ def test_run_ingest_query(temp_directory: Path, sample_query: ParsedQuery) -> No
     assert "dir2/file_dir2.txt" in content
 
 
+@pytest.mark.parametrize("max_file_size, expected_file_count", [(None, 8), (1_000_000, 8), (14, 3), (0, 0)])
+def test_process_node_max_file_size(
+    temp_directory: Path, sample_query: ParsedQuery, max_file_size: Optional[int], expected_file_count: int
+) -> None:
+    """
+    Test that `_process_node` skips files larger than the query's `max_file_size`.
+
+    Given a directory with files of various sizes and a `max_file_size` (None meaning no limit):
+    When `_process_node` walks the directory,
+    Then only the files whose size does not exceed the limit should be counted.
+    """
+    sample_query.local_path = temp_directory
+    sample_query.max_file_size = max_file_size
+    root_node = FileSystemNode(
+        name=temp_directory.name,
+        type=FileSystemNodeType.DIRECTORY,
+        path_str=".",
+        path=temp_directory,
+    )
+
+    _process_node(node=root_node, query=sample_query, stats=FileSystemStats())
+
+    assert root_node.file_count == expected_file_count
+
+
+def test_ingest_query_with_readme(
+    temp_directory: Path, sample_query: ParsedQuery, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test `ingest_query_with_readme` to ensure it returns the full tree and only the README content.
+
+    Given a directory with a README.md and nested .txt and .py files:
+    When `ingest_query_with_readme` is invoked,
+    Then the tree should list every directory and file, and only the README content should be returned.
+    """
+    monkeypatch.setattr(output_formatters, "_generate_token_string", lambda _: None)
+    (temp_directory / "README.md").write_text("# Test repo")
+    sample_query.local_path = temp_directory
+    sample_query.subpath = "/"
+    sample_query.type = None
+
+    summary, tree, readme_content = ingest_query_with_readme(sample_query)
+
+    assert "Files analyzed: 9" in summary
+    assert "src/" in tree
+    assert "file_subdir.py" in tree
+    assert readme_content is not None
+    assert "# Test repo" in readme_content
+    assert "Hello World" not in readme_content
+
+
+def test_ingest_query_with_readme_past_file_limit(
+    temp_directory: Path, sample_query: ParsedQuery, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test `ingest_query_with_readme` when the file limit is reached before the README is visited.
+
+    Given a directory with a lowercase readme.md and a file limit that no file fits in:
+    When `ingest_query_with_readme` is invoked,
+    Then no file should be analyzed, but the README content should still be returned.
+    """
+    monkeypatch.setattr(output_formatters, "_generate_token_string", lambda _: None)
+    monkeypatch.setattr("gitingest.ingestion.MAX_FILES", 0)
+    (temp_directory / "readme.md").write_text("# Test repo")
+    sample_query.local_path = temp_directory
+    sample_query.subpath = "/"
+    sample_query.type = None
+
+    summary, tree, readme_content = ingest_query_with_readme(sample_query)
+
+    assert "Files analyzed: 0" in summary
+    assert "readme.md" not in tree
+    assert readme_content is not None
+    assert "# Test repo" in readme_content
+
+
 # TODO: Additional tests:
 # - Multiple include patterns, e.g. ["*.txt", "*.py"] or ["/src/*", "*.txt"].
 # - Edge cases with weird file names or deep subdirectory structures.
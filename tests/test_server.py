@@ -0,0 +1,317 @@
+"""Tests for the server routers that do not require network access."""
+
+import asyncio
+import importlib
+import json
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from typing import Any, Dict, Tuple
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
+
+from gitingest.query_parsing import ParsedQuery
+from server import auth, query_processor, server_utils
+from tests.conftest import StubbedIngestion
+
+# `server.routers` re-exports the routers under the module names, so import the modules explicitly
+dynamic_module = importlib.import_module("server.routers.dynamic")
+index_module = importlib.import_module("server.routers.index")
+
+
+def test_home_page_is_rendered_once(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the home page is cached after the first render.
+
+    Given an empty home page cache:
+    When the home page is requested twice,
+    Then both responses should be identical and only one entry should be cached for the URL.
+    """
+    monkeypatch.setattr(index_module, "_HOME_HTML", OrderedDict())
+
+    first = client.get("/")
+    second = client.get("/")
+
+    assert first.status_code == 200
+    assert first.headers["content-type"].startswith("text/html")
+    assert first.content == second.content
+    assert 'content="http://localhost/"' in first.text
+    assert list(index_module._HOME_HTML) == ["http://localhost/"]
+
+
+def test_home_page_cache_evicts_least_recently_used(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the home page cache keeps the most recently used URLs.
+
+    Given a home page cache holding at most two pages:
+    When `/` is requested, then another URL, then `/` again and a third URL,
+    Then `/` should stay cached and the least recently used URL should be evicted.
+    """
+    monkeypatch.setattr(index_module, "_HOME_HTML", OrderedDict())
+    monkeypatch.setattr(index_module, "_HOME_HTML_MAX_ENTRIES", 2)
+
+    for path in ("/", "/?a=1", "/", "/?a=2"):
+        assert client.get(path).status_code == 200
+
+    assert list(index_module._HOME_HTML) == ["http://localhost/", "http://localhost/?a=2"]
+
+
+def test_dynamic_path_renders_git_page(client: TestClient) -> None:
+    """
+    Test the dynamic catch-all GET route.
+
+    Given a repository path:
+    When it is requested as HTML,
+    Then the precompiled git page template should be rendered with the repository URL pre-filled.
+    """
+    response = client.get("/octocat/Hello-World")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "octocat/Hello-World" in response.text
+
+
+def test_dynamic_json_requires_api_key(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test the dynamic catch-all GET route when a JSON response is requested without an API key.
+
+    Given a server without a configured API key:
+    When a dynamic path is requested with `response_type=json`,
+    Then the route-level dependency should reject it with a 403 JSON error.
+    """
+    monkeypatch.setattr(auth, "_API_KEY_BYTES", None)
+
+    response = client.get("/octocat/Hello-World", params={"response_type": "json"})
+
+    assert response.status_code == 403
+    assert response.json() == {"error": "API key required for JSON responses"}
+
+
+def test_dynamic_json_with_api_key(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test the dynamic catch-all GET route when a JSON response is requested with a valid API key.
+
+    Given a server with a configured API key:
+    When a dynamic path is requested with `response_type=json` and the matching key,
+    Then the repository URL and default parameters should be returned as JSON.
+    """
+    monkeypatch.setattr(auth, "_API_KEY_BYTES", b"secret")
+
+    response = client.get(
+        "/octocat/Hello-World",
+        params={"response_type": "json"},
+        headers={auth.API_KEY_NAME: "secret"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"repo_url": "octocat/Hello-World", "loading": True, "default_file_size": 243}
+
+
+def test_process_catch_all_json_skips_ingestion(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test the dynamic catch-all POST route when a JSON response is requested.
+
+    Given a server with a configured API key:
+    When the form is posted with `response_type=json`,
+    Then the form input should be echoed back without running `process_query`.
+    """
+
+    async def fail_process_query(*_: object, **__: object) -> None:
+        raise AssertionError("process_query should not be called for JSON responses")
+
+    monkeypatch.setattr(auth, "_API_KEY_BYTES", b"secret")
+    monkeypatch.setattr(dynamic_module, "process_query", fail_process_query)
+    form_data = {
+        "input_text": "https://github.com/octocat/Hello-World",
+        "max_file_size": "200",
+        "pattern_type": "include",
+        "pattern": "*.md",
+    }
+
+    response = client.post(
+        "/octocat/Hello-World",
+        params={"response_type": "json"},
+        headers={auth.API_KEY_NAME: "secret"},
+        data=form_data,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {**form_data, "max_file_size": 200, "status": "success"}
+
+
+def test_invalid_pattern_type_is_rejected(client: TestClient) -> None:
+    """
+    Test that the query form validates the pattern type.
+
+    Given a form with an unknown `pattern_type`:
+    When it is posted to the home page,
+    Then it should be rejected with a 422 before reaching the handler.
+    """
+    form_data = {
+        "input_text": "https://github.com/octocat/Hello-World",
+        "max_file_size": "243",
+        "pattern_type": "unknown",
+    }
+
+    response = client.post("/", data=form_data)
+
+    assert response.status_code == 422
+
+
+def test_stats_requires_api_key(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test the `/stats` endpoint without an API key.
+
+    Given a server without a configured API key:
+    When `/stats` is requested,
+    Then it should return a 403 JSON error without cloning anything.
+    """
+    monkeypatch.setattr(auth, "_API_KEY_BYTES", None)
+
+    response = client.post("/stats", json={"url": "https://github.com/octocat/Hello-World"})
+
+    assert response.status_code == 403
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"error": "API key required for JSON responses"}
+
+
+@pytest.mark.parametrize("include_readme", [True, False])
+def test_stats_response(client: TestClient, monkeypatch: pytest.MonkeyPatch, include_readme: bool) -> None:
+    """
+    Test the shape of a successful `/stats` response.
+
+    Given a server with a configured API key and a stubbed ingestion:
+    When `/stats` is requested with or without the README,
+    Then the repository, summary and tree should be returned, and the README only when requested.
+    """
+
+    async def fake_ingest_with_cache(**_: object) -> Tuple[str, str, str, str]:
+        return "summary", "tree", "readme", "id"
+
+    monkeypatch.setattr(auth, "_API_KEY_BYTES", b"secret")
+    monkeypatch.setattr(dynamic_module, "ingest_with_cache", fake_ingest_with_cache)
+
+    response = client.post(
+        "/stats",
+        params={"include_readme": include_readme},
+        headers={auth.API_KEY_NAME: "secret"},
+        json={"url": "https://github.com/octocat/Hello-World"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "success",
+        "repository": "https://github.com/octocat/Hello-World",
+        "summary": "summary",
+        "tree": "tree",
+        "readme_content": "readme" if include_readme else None,
+    }
+
+
+async def test_clone_slot_rejects_when_full(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test `clone_slot` when the client already uses all its concurrent clone slots.
+
+    Given a client holding `MAX_CONCURRENT_CLONES` slots:
+    When it tries to reserve another slot,
+    Then a 429 HTTPException with a `Retry-After` header should be raised, and all slots are released afterwards.
+    """
+    monkeypatch.setattr(server_utils, "_active_clones", {})
+    request = Request({"type": "http", "headers": [], "client": ("127.0.0.1", 1234)})
+
+    async with AsyncExitStack() as stack:
+        for _ in range(server_utils.MAX_CONCURRENT_CLONES):
+            await stack.enter_async_context(server_utils.clone_slot(request))
+
+        with pytest.raises(HTTPException) as exc_info:
+            async with server_utils.clone_slot(request):
+                pass
+
+    assert exc_info.value.status_code == 429
+    assert "Retry-After" in exc_info.value.headers
+    assert not server_utils._active_clones
+
+
+async def test_ingest_with_cache_reuses_results(
+    stubbed_ingestion: StubbedIngestion, sample_query: ParsedQuery
+) -> None:
+    """
+    Test that `ingest_with_cache` only clones and ingests once for identical requests.
+
+    Given an empty ingest cache:
+    When the same repository is ingested twice, then once more after the cache is cleared,
+    Then the repository should be cloned twice, and both first calls should return the same result.
+    """
+    semaphore = stubbed_ingestion.clone_semaphore
+
+    first = await query_processor.ingest_with_cache(sample_query.url, None, None, 1024, semaphore)
+    second = await query_processor.ingest_with_cache(sample_query.url, None, None, 1024, semaphore)
+
+    assert first == second == ("summary", "tree", "content", sample_query.id)
+    assert len(stubbed_ingestion.clone_calls) == 1
+
+    assert query_processor.clear_ingest_cache() == 1
+    await query_processor.ingest_with_cache(sample_query.url, None, None, 1024, semaphore)
+    assert len(stubbed_ingestion.clone_calls) == 2
+
+
+async def test_ingest_with_cache_evicts_by_size(
+    stubbed_ingestion: StubbedIngestion, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that `ingest_with_cache` bounds the total size of the cached results.
+
+    Given an ingest cache holding at most 40 characters and ingest results of 20 characters:
+    When three repositories are ingested, then a result too large for the cache on its own,
+    Then only the two most recent results should be kept, and the large one should not be cached.
+    """
+    contents = {"a": "x" * 9, "b": "x" * 9, "c": "x" * 9, "large": "x" * 100}
+    monkeypatch.setattr(query_processor, "INGEST_CACHE_MAX_CHARS", 40)
+    monkeypatch.setattr(query_processor, "ingest_query", lambda query: ("summary", "tree", contents[query.slug]))
+
+    for source in ("a", "b", "c", "large"):
+        await query_processor.ingest_with_cache(source, None, None, 1024, stubbed_ingestion.clone_semaphore)
+
+    assert [key[0] for key in query_processor._ingest_cache.entries] == ["b", "c"]
+    assert query_processor._ingest_cache.chars == 40
+
+
+async def test_ingest_with_cache_coalesces_concurrent_requests(
+    stubbed_ingestion: StubbedIngestion, sample_query: ParsedQuery
+) -> None:
+    """
+    Test that concurrent identical calls to `ingest_with_cache` share a single ingestion.
+
+    Given an empty ingest cache and a slow clone:
+    When the same repository is ingested by several concurrent requests,
+    Then the repository should be cloned only once and every request should get the same result.
+    """
+    semaphore = stubbed_ingestion.clone_semaphore
+    results = await asyncio.gather(
+        *(query_processor.ingest_with_cache(sample_query.url, None, None, 1024, semaphore) for _ in range(5))
+    )
+
+    assert len(stubbed_ingestion.clone_calls) == 1
+    assert len(set(results)) == 1
+    assert not query_processor._inflight_ingests
+
+
+@pytest.mark.parametrize("payload", [{}, {"status": "success", "tree": "└── dir/\n"}])
+async def test_stream_json_with_content(monkeypatch: pytest.MonkeyPatch, payload: Dict[str, Any]) -> None:
+    """
+    Test that `stream_json_with_content` produces a valid JSON document.
+
+    Given a payload and content containing characters that need escaping, split over several chunks:
+    When the streamed body is joined and decoded,
+    Then it should equal the payload with the content added under the "content" key.
+    """
+    monkeypatch.setattr(server_utils, "STREAM_CHUNK_SIZE", 3)
+    content = 'line "one"\\\nline\ttwo — ünïcode 🚀\x00'
+
+    response = server_utils.stream_json_with_content(payload, content)
+    body = b"".join([chunk async for chunk in response.body_iterator])
+
+    assert response.media_type == "application/json"
+    assert json.loads(body) == {**payload, "content": content}